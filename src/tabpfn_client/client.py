@@ -5,6 +5,7 @@ from __future__ import annotations
 
 from uuid import UUID
 import base64
+import copy
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from importlib.metadata import PackageNotFoundError, version
 import io
@@ -18,7 +19,7 @@ import time
 import traceback
 import warnings
 from pydantic import BaseModel, ValidationError
-from typing import Any, cast, Mapping, NoReturn
+from typing import Any, Callable, cast, Mapping, NoReturn
 from typing_extensions import (
     Never,  # in `typing` only from Python 3.11
     TypeVar,  # supports default= on Python 3.10
@@ -152,6 +153,20 @@ def _serialize_to_parquet(df: pd.DataFrame) -> tuple[bytes, str]:
     return parquet_bytes, crc32c_b64
 
 
+def _make_httpx_client(base_url: str) -> httpx.Client:
+    """Build the pooled HTTP client shared by all ServiceClient calls.
+
+    Keep-alive connections are reused across auth, usage and inference calls so
+    the TCP + TLS handshake is only paid once per connection."""
+    return httpx.Client(
+        base_url=base_url,
+        timeout=get_opts().TABPFN_CLIENT_TIMEOUT,
+        headers={"Prior-Client-Version": get_client_version()},
+        follow_redirects=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=20),
+    )
+
+
 SuccessT = TypeVar("SuccessT", bound=BaseModel)
 ErrorT = TypeVar("ErrorT", bound=BaseModel, default=Never)
 
@@ -159,6 +174,10 @@ ErrorT = TypeVar("ErrorT", bound=BaseModel, default=Never)
 # negative value must neither busy-poll the endpoint nor crash `time.sleep`.
 _MIN_RETRY_INTERVAL_SECS = 0.3
 
+# Download responses are written to disk in chunks of this size, so memory use
+# stays flat however large the archive is.
+_DOWNLOAD_CHUNK_SIZE = 1 << 20
+
 
 class ServiceClient(Singleton):
     """
@@ -186,15 +205,15 @@ class ServiceClient(Singleton):
     # benefit from HTTP/2's multiplexing or HPACK in any measurable way
     # (one request per fit, dominated by the multipart body), so the
     # tradeoff is one-sided.
-    httpx_client = httpx.Client(
-        base_url=base_url,
-        timeout=get_opts().TABPFN_CLIENT_TIMEOUT,
-        headers={"Prior-Client-Version": get_client_version()},
-        follow_redirects=True,
-    )
+    httpx_client = _make_httpx_client(base_url)
     _access_token: str | None = None
     _api_settings: GetSettingsResponse | None = None
     _api_settings_ts: float = 0.0
+    # path -> (ETag, JSON body) of revalidated GETs, see `_get_json_revalidated`
+    _etag_cache: dict[str, tuple[str, Any]] = {}
+    # called after the server rejected the active token with HTTP 401, so that
+    # copies of the token kept outside this class are dropped as well
+    _on_unauthorized: Callable[[], None] | None = None
 
     @classmethod
     def get_access_token(cls):
@@ -254,6 +273,9 @@ class ServiceClient(Singleton):
 
     @classmethod
     def authorize(cls, access_token: str):
+        if access_token != cls._access_token:
+            # cached bodies may be specific to the previous user
+            cls._etag_cache.clear()
         get_opts().TABPFN_TOKEN = access_token
         cls._access_token = access_token
         cls.httpx_client.headers.update(
@@ -263,8 +285,32 @@ class ServiceClient(Singleton):
     @classmethod
     def reset_authorization(cls):
         cls._access_token = None
+        cls._etag_cache.clear()
         cls.httpx_client.headers.pop("Authorization", None)
 
+    @classmethod
+    def _handle_unauthorized(cls):
+        """Forget the active token after an authenticated call failed with 401."""
+        if cls._access_token is None:
+            return
+        logger.debug("Access token was rejected by the server")
+        cls.reset_authorization()
+        if cls._on_unauthorized is not None:
+            cls._on_unauthorized()
+
+    @classmethod
+    def _close_client(cls):
+        """Close the pooled connections and start over with a fresh client.
+
+        The authorization header is carried over, so this only drops the
+        connection pool and never logs the user out on its own."""
+        cls.httpx_client.close()
+        cls.httpx_client = _make_httpx_client(cls.base_url)
+        if cls._access_token is not None:
+            cls.httpx_client.headers.update(
+                {"Authorization": f"Bearer {cls._access_token}"}
+            )
+
     @classmethod
     def fit(
         cls,
@@ -924,6 +970,9 @@ class ServiceClient(Singleton):
         if trace_id := body.get("trace_id"):
             error_message += f" Report trace ID: {trace_id}."
 
+        if response.status_code == 401:
+            ServiceClient._handle_unauthorized()
+
         if response.status_code in {408, 502, 503, 504}:
             raise RetryableServerError(error_message)
 
@@ -943,6 +992,31 @@ class ServiceClient(Singleton):
         body, message = ServiceClient._read_json_body(response)
         ServiceClient._raise_http_error(response, method_name, body, message)
 
+    @classmethod
+    def _get_json_revalidated(cls, path: str, method_name: str) -> Any:
+        """GET `path` and return its JSON body.
+
+        If an earlier response carried an ETag, it is sent back as
+        If-None-Match, and a 304 reuses the earlier body instead of
+        transferring it again. Without an ETag every call is a plain GET, so the
+        result is never staler than what the server would return."""
+        cached = cls._etag_cache.get(path)
+        response = cls.httpx_client.get(
+            path, headers={"If-None-Match": cached[0]} if cached else None
+        )
+        if response.status_code == 304 and cached is not None:
+            cls._check_version(response)
+            return copy.deepcopy(cached[1])
+
+        cls._raise_on_error(response, method_name)
+        body = response.json()
+        etag = response.headers.get("ETag")
+        if etag:
+            cls._etag_cache[path] = (etag, copy.deepcopy(body))
+        else:
+            cls._etag_cache.pop(path, None)
+        return body
+
     @staticmethod
     def _validate_response(
         response: httpx.Response,
@@ -991,7 +1065,7 @@ class ServiceClient(Singleton):
             if response.status_code == 200:
                 found_valid_connection = True
 
-        except httpx.ConnectError as e:
+        except httpx.TransportError as e:
             logger.error(f"Failed to connect to the server with error: {e}")
             traceback.print_exc()
             found_valid_connection = False
@@ -999,23 +1073,81 @@ class ServiceClient(Singleton):
         return found_valid_connection
 
     @classmethod
-    def is_auth_token_outdated(cls, access_token) -> bool | None:
-        """
-        Check if the provided access token is valid and return True if successful.
-        """
-        is_authenticated = False
+    # Idempotent GET on the startup path: failures to get a connection are
+    # retried with a short exponential backoff. Read timeouts are not, each
+    # attempt may already have waited the full client timeout.
+    @backoff.on_exception(
+        backoff.expo,
+        (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout),
+        max_tries=3,
+        factor=0.25,
+        logger=logger,
+        on_backoff=_on_backoff,
+        on_giveup=_on_giveup,
+    )
+    def _get_auth_token_status(cls, access_token) -> int:
+        """Status code of the server validating the provided access token."""
         response = cls.httpx_client.get(
             cls.server_endpoints.protected_root.path,
             headers={"Authorization": f"Bearer {access_token}"},
         )
 
         cls._check_version(response)
-        if response.status_code == 200:
-            is_authenticated = True
-        elif response.status_code == 403:
+        return response.status_code
+
+    @staticmethod
+    def _auth_token_validity(status_code: int) -> bool | None:
+        if status_code == 200:
+            return True
+        elif status_code == 403:
             # 403 means user is not verified
-            is_authenticated = None
-        return is_authenticated
+            return None
+        return False
+
+    @classmethod
+    def is_auth_token_outdated(cls, access_token) -> bool | None:
+        """
+        Check if the provided access token is valid and return True if successful.
+        """
+        return cls._auth_token_validity(cls._get_auth_token_status(access_token))
+
+    @classmethod
+    def start_session(cls, access_token) -> tuple[bool | None, int, list[str] | None]:
+        """
+        Validate the access token and fetch the greeting messages in one go.
+
+        Both requests are issued concurrently on the pooled client, so starting a
+        session costs one round trip instead of two. The server has no combined
+        endpoint for this.
+
+        Returns
+        -------
+        is_valid : bool | None
+            Same as `is_auth_token_outdated`.
+        status_code : int
+            The status code of the token validation.
+        greeting_messages : list[str] | None
+            The new greeting messages, or None if the token is not valid or they
+            could not be fetched.
+        """
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            greeting_future = pool.submit(
+                cls.httpx_client.get,
+                cls.server_endpoints.retrieve_greeting_messages.path,
+                headers={"Authorization": f"Bearer {access_token}"},
+            )
+            status_code = cls._get_auth_token_status(access_token)
+            is_valid = cls._auth_token_validity(status_code)
+
+            try:
+                response = greeting_future.result()
+            except Exception:
+                logger.debug("Failed to prefetch greeting messages", exc_info=True)
+                return is_valid, status_code, None
+
+        if is_valid is not True or response.status_code != 200:
+            return is_valid, status_code, None
+        return is_valid, status_code, response.json()["messages"]
 
     @classmethod
     def validate_email(cls, email: str) -> tuple[bool, str]:
@@ -1191,12 +1323,9 @@ class ServiceClient(Singleton):
             The password policy returned from the server.
         """
 
-        response = cls.httpx_client.get(
-            cls.server_endpoints.password_policy.path,
-        )
-        cls._check_version(response)
-
-        return response.json()["requirements"]
+        return cls._get_json_revalidated(
+            cls.server_endpoints.password_policy.path, "get_password_policy"
+        )["requirements"]
 
     @classmethod
     def send_reset_password_email(cls, email: str) -> tuple[bool, str]:
@@ -1258,12 +1387,9 @@ class ServiceClient(Singleton):
         data_summary : dict
             The data summary returned from the server.
         """
-        response = cls.httpx_client.get(
-            cls.server_endpoints.get_data_summary.path,
+        return cls._get_json_revalidated(
+            cls.server_endpoints.get_data_summary.path, "get_data_summary"
         )
-        cls._raise_on_error(response, "get_data_summary")
-
-        return response.json()
 
     @classmethod
     def download_all_data(cls, save_dir: Path) -> Path | None:
@@ -1279,22 +1405,25 @@ class ServiceClient(Singleton):
 
         save_path = None
 
-        full_url = cls.base_url + cls.server_endpoints.download_all_data.path
-        with httpx.stream(
+        with cls.httpx_client.stream(
             "GET",
-            full_url,
-            headers={
-                "Authorization": f"Bearer {cls.get_access_token()}",
-                "Prior-Client-Version": get_client_version(),
-            },
+            cls.server_endpoints.download_all_data.path,
         ) as response:
             cls._raise_on_error(response, "download_all_data")
 
             filename = response.headers["Content-Disposition"].split("filename=")[1]
             save_path = Path(save_dir) / filename
-            with open(save_path, "wb") as f:
-                for data in response.iter_bytes():
-                    f.write(data)
+            # Written under a temporary name first, so an interrupted download
+            # never leaves a truncated archive behind under the final name.
+            part_path = save_path.with_name(save_path.name + ".part")
+            try:
+                with open(part_path, "wb") as f:
+                    for data in response.iter_bytes(_DOWNLOAD_CHUNK_SIZE):
+                        f.write(data)
+                part_path.replace(save_path)
+            except BaseException:
+                part_path.unlink(missing_ok=True)
+                raise
 
         return save_path
 
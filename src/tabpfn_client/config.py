@@ -1,22 +1,43 @@
 #  Copyright (c) Prior Labs GmbH 2025.
 #  Licensed under the Apache License, Version 2.0
 
+import atexit
+import os
 import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-from httpx import ConnectError
+from httpx import TransportError
 
 from tabpfn_client.client import ServiceClient
 from tabpfn_client.service_wrapper import UserAuthenticationClient
-from tabpfn_client.constants import CACHE_DIR
-from tabpfn_client.prompt_agent import PromptAgent
-from tabpfn_client.ui import console, warn
+from tabpfn_client.constants import get_cache_dir
 from tabpfn_client.options import reload_opts
 
 
-CONNECTION_ERROR = RuntimeError(
-    "TabPFN is inaccessible at the moment, please try again later."
+# Only the message is shared: a module-level exception instance would have its
+# `__traceback__` mutated by every raise, across threads.
+_CONNECTION_ERROR_MSG = "TabPFN is inaccessible at the moment, please try again later."
+
+# release the pooled connections of the shared HTTP client on interpreter exit
+atexit.register(lambda: ServiceClient.httpx_client.close())
+
+# usage counters move on the order of seconds; repeated `get_api_usage()` calls
+# within this window are answered from memory, keyed by access token
+_API_USAGE_TTL_SECS = 30.0
+_api_usage_cache: dict[str, tuple[float, dict]] = {}
+
+_USAGE_TEMPLATE = (
+    "Currently, you have used {current} of the allowed limit of {limit} credits. "
+    "The limit will reset at {reset}."
 )
 
+# Serializes every transition of the `Config` state: the first `init()`, so
+# concurrent callers don't each run the login flow, as well as `reset()` and
+# `set_access_token()`, so they never interleave with a running `init()`.
+_init_lock = threading.Lock()
+
 
 class Config:
     def __new__(cls, *args, **kwargs):
@@ -43,67 +64,102 @@ def init(use_server=True):
                        True is supported.
     :raises RuntimeError: If local inference is requested or if the server is unreachable.
     """
-    # initialize config
-    Config.use_server = use_server
+    if not use_server:
+        # checked upfront, so a failing call never touches the `Config` state
+        raise RuntimeError("Local inference is not supported yet.")
 
     if Config.is_initialized:
         # Only do the following if the initialization has not been done yet
         return
 
+    with _init_lock:
+        if not Config.is_initialized:
+            _init()
+
+
+def _init():
+    # Deferred: the prompt/UI modules pull in rich and password_strength, which
+    # are only needed once the authentication flow actually runs.
+    from tabpfn_client.prompt_agent import PromptAgent
+    from tabpfn_client.ui import console, warn
+
+    # initialize config
+    Config.use_server = True
+
     reload_opts()
 
-    if use_server:
-        try:
-            is_valid_token, access_token = (
-                UserAuthenticationClient.try_reuse_existing_token()
-            )
-        except ConnectError:
-            raise CONNECTION_ERROR
-
-        if is_valid_token:
-            PromptAgent.prompt_reusing_existing_token()
-        elif access_token is not None:
-            if not UserAuthenticationClient.is_accessible_connection():
-                raise CONNECTION_ERROR
-            # token holds invalid due to user email verification
-            console.print()
-            warn("Email not verified")
-            console.print(
-                "  [blue]You need to verify your email before continuing.[/blue]"
-            )
-            result = PromptAgent.reverify_email(access_token)
-
-            if result == "restart":
-                # User chose to start over - show main menu
-                PromptAgent.prompt_welcome()
-                success = PromptAgent.prompt_and_set_token()
-                if not success:
-                    return
-            elif result is False:
-                # User chose to quit - exit without showing menu
-                return
-            # else: result is True, verification successful, continue to greeting messages
-        else:
-            if not UserAuthenticationClient.is_accessible_connection():
-                raise CONNECTION_ERROR
+    try:
+        is_valid_token, access_token = (
+            UserAuthenticationClient.try_reuse_existing_token()
+        )
+    except TransportError:
+        # connect errors as well as timeouts and pool exhaustion on the shared client
+        raise RuntimeError(_CONNECTION_ERROR_MSG) from None
+
+    if is_valid_token:
+        # validating the token already reached the server, no need to probe
+        # the connection again
+        PromptAgent.prompt_reusing_existing_token()
+    elif access_token is not None:
+        if not UserAuthenticationClient.is_accessible_connection():
+            raise RuntimeError(_CONNECTION_ERROR_MSG) from None
+        # token holds invalid due to user email verification
+        console.print()
+        warn("Email not verified")
+        console.print("  [blue]You need to verify your email before continuing.[/blue]")
+        result = PromptAgent.reverify_email(access_token)
+
+        if result == "restart":
+            # User chose to start over - show main menu
             PromptAgent.prompt_welcome()
-            # prompt for login / register
             success = PromptAgent.prompt_and_set_token()
             if not success:
-                # User interrupted or quit - don't mark as initialized
                 return
+        elif result is False:
+            # User chose to quit - exit without showing menu
+            return
+        # else: result is True, verification successful, continue to greeting messages
+    else:
+        if not UserAuthenticationClient.is_accessible_connection():
+            raise RuntimeError(_CONNECTION_ERROR_MSG) from None
+        PromptAgent.prompt_welcome()
+        # prompt for login / register
+        success = PromptAgent.prompt_and_set_token()
+        if not success:
+            # User interrupted or quit - don't mark as initialized
+            return
+
+    # Both calls only need the authorized client, so pay one round trip
+    # for the two of them instead of one each.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        greeting_future = executor.submit(
+            UserAuthenticationClient.retrieve_greeting_messages
+        )
+        settings_future = executor.submit(ServiceClient.get_settings)
 
+        try:
+            greeting_messages = greeting_future.result()
+        except TransportError:
+            # a token reused without asking the server means these are the
+            # first requests of this process
+            raise RuntimeError(_CONNECTION_ERROR_MSG) from None
         # Print new greeting messages. If there are no new messages, nothing will be printed.
-        PromptAgent.prompt_retrieved_greeting_messages(
-            UserAuthenticationClient.retrieve_greeting_messages()
-        )
+        PromptAgent.prompt_retrieved_greeting_messages(greeting_messages)
+        _ = settings_future.result()
 
-        _ = ServiceClient.get_settings()
+    Config.token = ServiceClient.get_access_token()
+    Config.is_initialized = True
+
+
+def _forget_rejected_token():
+    """Drop the token after the server rejected it with a 401, in memory and on
+    disk, so the next `init()` asks for a login instead of reusing it."""
+    Config.is_initialized = False
+    Config.token = None
+    UserAuthenticationClient.reset_cache()
 
-        Config.use_server = True
-        Config.is_initialized = True
-    else:
-        raise RuntimeError("Local inference is not supported yet.")
+
+ServiceClient._on_unauthorized = _forget_rejected_token
 
 
 def reset():
@@ -113,13 +169,22 @@ def reset():
     Use this function if you need to log out or clear stored session data
     from the local machine.
     """
-    Config.is_initialized = False
-    # reset user auth handler
-    if Config.use_server:
-        UserAuthenticationClient.reset_cache()
+    with _init_lock:
+        Config.is_initialized = False
+        Config.token = None
+        _api_usage_cache.clear()
+        # reset user auth handler
+        if Config.use_server:
+            UserAuthenticationClient.reset_cache()
 
-    # remove cache dir
-    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+        # drop pooled connections, so nothing survives a logout
+        ServiceClient._close_client()
+
+        # remove cache dir; the common case in tests and fresh installs is that
+        # there is none, which a single stat settles
+        cache_dir = get_cache_dir()
+        if os.path.isdir(cache_dir):
+            shutil.rmtree(cache_dir, ignore_errors=True)
 
 
 def get_access_token() -> str:
@@ -130,10 +195,14 @@ def get_access_token() -> str:
 
     :return: The access token string used for API requests.
     """
+    if Config.token is not None:
+        return Config.token
+
     init()
     access_token = ServiceClient.get_access_token()
     if access_token is None:
-        raise CONNECTION_ERROR
+        raise RuntimeError(_CONNECTION_ERROR_MSG) from None
+    Config.token = access_token
     return access_token
 
 
@@ -151,8 +220,13 @@ def set_access_token(access_token: str):
 
     :param access_token: A valid TabPFN access token string.
     """
-    UserAuthenticationClient.set_token(access_token)
-    Config.is_initialized = True
+    with _init_lock:
+        UserAuthenticationClient.set_token(access_token)
+        # `init()` returns early from now on, so the server mode it would set
+        # has to be set here
+        Config.use_server = True
+        Config.token = access_token
+        Config.is_initialized = True
 
 
 def get_api_usage() -> str:
@@ -163,5 +237,16 @@ def get_api_usage() -> str:
              the total limit, and when the limit resets.
     """
     access_token = get_access_token()
-    response = ServiceClient.get_api_usage(access_token)
-    return f"Currently, you have used {response['current_usage']} of the allowed limit of {'Unlimited' if int(response['usage_limit']) == -1 else response['usage_limit']} credits. The limit will reset at {response['reset_time']}."
+    cached = _api_usage_cache.get(access_token)
+    if cached is not None and (time.monotonic() - cached[0]) < _API_USAGE_TTL_SECS:
+        response = cached[1]
+    else:
+        response = ServiceClient.get_api_usage(access_token)
+        _api_usage_cache[access_token] = (time.monotonic(), response)
+
+    raw_limit = response["usage_limit"]
+    # -1 means unlimited; the server may send it as int or str
+    limit = "Unlimited" if raw_limit == -1 or raw_limit == "-1" else raw_limit
+    return _USAGE_TEMPLATE.format(
+        current=response["current_usage"], limit=limit, reset=response["reset_time"]
+    )
@@ -1,9 +1,26 @@
 #  Copyright (c) Prior Labs GmbH 2025.
 #  Licensed under the Apache License, Version 2.0
 
+import functools
 from pathlib import Path
+from typing import Any
+
+_CACHE_DIR_RAW = Path(__file__).parent / ".tabpfn"
+
+
+@functools.lru_cache(maxsize=1)
+def get_cache_dir() -> Path:
+    """Absolute path of the local cache dir, resolved on first use only."""
+    return _CACHE_DIR_RAW.resolve()
+
+
+def __getattr__(name: str) -> Any:
+    # `CACHE_DIR` is kept as a lazy alias, so importing this module does not
+    # pay for the `resolve()` syscalls.
+    if name == "CACHE_DIR":
+        return get_cache_dir()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-CACHE_DIR = Path(__file__).parent.resolve() / ".tabpfn"
 
 URL_TABPFN_CLIENT_GITHUB_ISSUES = "https://github.com/priorlabs/tabpfn-client/issues"
 URL_PRIOR_LABS_TERMS_AND_CONDITIONS = (
@@ -2,12 +2,14 @@
 #  Licensed under the Apache License, Version 2.0
 from __future__ import annotations
 
+import functools
 import getpass
 import sys
 import textwrap
-from rich.table import Table
-
-from password_strength import PasswordPolicy
+import threading
+import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING
 
 from tabpfn_client.constants import (
     URL_PRIOR_LABS_TERMS_AND_CONDITIONS,
@@ -23,6 +25,28 @@ from tabpfn_client.ui import (
     print_logo,
 )
 
+if TYPE_CHECKING:
+    # rich.table and password_strength are only needed on the interactive
+    # login/registration path, so they are imported where they are used.
+    from password_strength import PasswordPolicy
+
+_YES = frozenset({"y", "yes"})
+_NO = frozenset({"n", "no"})
+
+
+@functools.lru_cache(maxsize=1)
+def _main_menu_table():
+    """The account access menu; static, so it is built once on first use."""
+    from rich.table import Table
+
+    table = Table(box=None, show_header=False, pad_edge=False, show_edge=False)
+    table.add_column("#", style="bold cyan", width=5)
+    table.add_column("Action")
+    table.add_row("\\[1]", "Create a TabPFN account")
+    table.add_row("\\[2]", "Login to your TabPFN account")
+    table.add_row("\\[q]", "Quit")
+    return table
+
 
 def maybe_graceful_exit() -> None:
     try:
@@ -36,6 +60,16 @@ def maybe_graceful_exit() -> None:
 
 
 class PromptAgent:
+    # The password policy is effectively static; cache it for retries within
+    # the same process, see `_get_password_policy`.
+    _PASSWORD_POLICY_TTL_SECS = 300.0
+    _password_policy: tuple[list[tuple[str, str]], PasswordPolicy] | None = None
+    _password_policy_ts: float = 0.0
+    # Accepted emails, normalized, so re-entering an address after a failed
+    # registration step does not trigger another validation, see `_validate_email`.
+    _EMAIL_VALIDATION_CACHE_SIZE = 32
+    _email_validation_cache: dict[str, tuple[bool, str]] = {}
+
     def __new__(cls):
         raise RuntimeError(
             "This class should not be instantiated. Use classmethods instead."
@@ -52,16 +86,124 @@ class PromptAgent:
         console.print(PromptAgent.indent(text))
 
     @staticmethod
-    def password_req_to_policy(password_req: list[str]):
+    def _parse_password_req(password_req: list[str]) -> list[tuple[str, int, str]]:
         """
-        Convert password requirement strings like "Length(8)" into a PasswordPolicy.
+        Parse password requirement strings like "Length(8)" into
+        (name, number, original) tuples, e.g. ("length", 8, "Length(8)").
         """
-        requirements = {}
+        parsed = []
         for req in password_req:
             word_part, number_part = req.split("(")
-            number = int(number_part[:-1])
-            requirements[word_part.lower()] = number
-        return PasswordPolicy.from_names(**requirements)
+            parsed.append((word_part.lower(), int(number_part[:-1]), req))
+        return parsed
+
+    @staticmethod
+    def password_req_to_policy(password_req: list[str]):
+        """
+        Convert password requirement strings like "Length(8)" into a PasswordPolicy.
+        """
+        from password_strength import PasswordPolicy
+
+        parsed = PromptAgent._parse_password_req(password_req)
+        return PasswordPolicy.from_names(**{name: number for name, number, _ in parsed})
+
+    @classmethod
+    def _get_password_policy(
+        cls, prefetched: Future | None = None
+    ) -> tuple[list[tuple[str, str]], PasswordPolicy]:
+        """Fetch the password requirements, as (name, display text) pairs, and
+        their PasswordPolicy. The result is cached for `_PASSWORD_POLICY_TTL_SECS`,
+        so the requirement strings are parsed once, not on every attempt.
+
+        If `prefetched` (from `_prefetch_password_policy`) is given, its result
+        is awaited instead of issuing a new request."""
+        cached = cls._cached_password_policy()
+        if cached is not None:
+            return cached
+
+        if prefetched is not None and prefetched.done():
+            return prefetched.result()
+        with status("Retrieving password policy"):
+            if prefetched is not None:
+                return prefetched.result()
+            return cls._fetch_password_policy()
+
+    @classmethod
+    def _cached_password_policy(
+        cls,
+    ) -> tuple[list[tuple[str, str]], PasswordPolicy] | None:
+        if (
+            cls._password_policy is not None
+            and (time.monotonic() - cls._password_policy_ts)
+            < cls._PASSWORD_POLICY_TTL_SECS
+        ):
+            return cls._password_policy
+        return None
+
+    @classmethod
+    def _fetch_password_policy(cls) -> tuple[list[tuple[str, str]], PasswordPolicy]:
+        from password_strength import PasswordPolicy
+
+        password_req = UserAuthenticationClient.get_password_policy()
+        parsed = cls._parse_password_req(password_req)
+        cls._password_policy = (
+            [(name, req) for name, _, req in parsed],
+            PasswordPolicy.from_names(**{name: number for name, number, _ in parsed}),
+        )
+        cls._password_policy_ts = time.monotonic()
+        return cls._password_policy
+
+    @classmethod
+    def _prefetch_password_policy(cls) -> Future | None:
+        """Start fetching the password policy in the background, so it is
+        usually ready by the time the user has typed their email. Returns None
+        if the cached policy is still fresh.
+
+        Runs on a daemon thread rather than an executor, whose workers are
+        joined at interpreter exit: quitting while the request hangs must not
+        wait for it to time out."""
+        if cls._cached_password_policy() is not None:
+            return None
+        future: Future = Future()
+
+        def _fetch():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(cls._fetch_password_policy())
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(
+            target=_fetch, name="tabpfn-password-policy", daemon=True
+        ).start()
+        return future
+
+    @classmethod
+    def _validate_email(cls, email: str) -> tuple[bool, str]:
+        """Validate `email` with the server, rejecting obviously malformed
+        addresses locally and reusing an earlier acceptance of the same address.
+
+        Rejections are not cached: the server also rejects on transient errors
+        (e.g. 429 or 5xx), which must not lock the address until a restart."""
+        local_part, _, domain = email.rpartition("@")
+        if not local_part or "." not in domain:
+            return False, "Please enter a valid email address."
+
+        key = email.strip().lower()
+        cached = cls._email_validation_cache.get(key)
+        if cached is not None:
+            return cached
+
+        with status("Validating email"):
+            result = UserAuthenticationClient.validate_email(email)
+        if not result[0]:
+            return result
+        if len(cls._email_validation_cache) >= cls._EMAIL_VALIDATION_CACHE_SIZE:
+            # evict the oldest entry (dicts keep insertion order)
+            del cls._email_validation_cache[next(iter(cls._email_validation_cache))]
+        cls._email_validation_cache[key] = result
+        return result
 
     @staticmethod
     def show_password_requirements(
@@ -76,21 +218,20 @@ class PromptAgent:
 
     @staticmethod
     def display_requirement_status(
-        password: str, password_req: list[str], password_policy: PasswordPolicy
+        password: str,
+        password_reqs: list[tuple[str, str]],
+        failed_tests: list,
     ) -> None:
-        """Display check marks for met/unmet requirements."""
+        """Display check marks for met/unmet requirements, given as the
+        preparsed (name, display text) pairs from `_get_password_policy`.
+        `failed_tests` is the result of `password_policy.test(password)`."""
         if not password:
             return
 
-        failed_tests = password_policy.test(password)
         failed_names = {test.name() for test in failed_tests}
 
         console.print("  Requirements:")
-        for req in password_req:
-            # Parse requirement like "Length(8)" -> ("length", "8")
-            word_part, _ = req.split("(")
-            req_key = word_part.lower()
-
+        for req_key, req in password_reqs:
             # Check if this requirement is in failed tests
             is_met = req_key not in failed_names
             if is_met:
@@ -140,13 +281,7 @@ class PromptAgent:
     def _prompt_and_set_token_impl(cls) -> bool:
         # Account access section — compact UI
         console.print(cls.indent("\n"))
-        table = Table(box=None, show_header=False, pad_edge=False, show_edge=False)
-        table.add_column("#", style="bold cyan", width=5)
-        table.add_column("Action")
-        table.add_row("\\[1]", "Create a TabPFN account")
-        table.add_row("\\[2]", "Login to your TabPFN account")
-        table.add_row("\\[q]", "Quit")
-        console.print(table)
+        console.print(_main_menu_table())
 
         # Prompt for a valid choice using Rich input
         valid_choices = {"1", "2", "q"}
@@ -182,16 +317,14 @@ class PromptAgent:
 
             # Step 2: Email
             console.print("\n[bold cyan]Step 2/6[/bold cyan] - Account Details")
+            policy_future = cls._prefetch_password_policy()
             while True:
                 email = console.input("Email: ").strip()
                 if not email:
                     warn("Email is required.")
                     continue
 
-                with status("Validating email"):
-                    is_valid, message = UserAuthenticationClient.validate_email(
-                        str(email)
-                    )
+                is_valid, message = cls._validate_email(str(email))
                 if is_valid:
                     break
                 warn(f"  {message}")
@@ -202,13 +335,11 @@ class PromptAgent:
             # Step 3: Password
             console.print("\n[bold cyan]Step 3/6[/bold cyan] - Create Password")
 
-            with status("Retrieving password policy"):
-                password_req = UserAuthenticationClient.get_password_policy()
-            password_policy = cls.password_req_to_policy(password_req)
+            password_reqs, password_policy = cls._get_password_policy(policy_future)
 
             # Show requirements upfront
             console.print("\n  Requirements:")
-            for req in password_req:
+            for _, req in password_reqs:
                 console.print(f"    [bright_black]•[/bright_black] {req}")
 
             password = None
@@ -220,7 +351,7 @@ class PromptAgent:
                 if len(failed_tests) != 0:
                     console.print()
                     cls.display_requirement_status(
-                        password, password_req, password_policy
+                        password, password_reqs, failed_tests
                     )
                     console.print(
                         "  [cyan]Enter a password that meets all requirements.[/cyan]"
@@ -380,36 +511,28 @@ class PromptAgent:
             f"[link={URL_PRIOR_LABS_TERMS_AND_CONDITIONS}]{URL_PRIOR_LABS_TERMS_AND_CONDITIONS}[/link]"
         )
 
-        while True:
-            choice = (
-                console.input("[bold cyan]→[/bold cyan] I agree? (y/n): ")
-                .strip()
-                .lower()
-            )
-            if choice in ["y", "yes"]:
-                return True
-            elif choice in ["n", "no"]:
-                return False
-            else:
-                warn("Please enter 'y' or 'n'.")
+        return cls._yn("[bold cyan]→[/bold cyan] I agree? (y/n): ")
 
     @classmethod
     def prompt_personally_identifiable_information(cls) -> bool:
         """Simplified data privacy prompt for registration flow."""
         console.print("I agree not to upload personal, confidential or sensitive data.")
 
+        return cls._yn("[bold cyan]→[/bold cyan] I agree (y/n): ")
+
+    @staticmethod
+    def _yn(prompt: str, default: bool | None = None) -> bool:
+        """Ask a yes/no question until answered; an empty answer returns
+        `default`, if given."""
         while True:
-            choice = (
-                console.input("[bold cyan]→[/bold cyan] I agree (y/n): ")
-                .strip()
-                .lower()
-            )
-            if choice in ["y", "yes"]:
+            choice = console.input(prompt).strip().lower()
+            if choice in _YES:
                 return True
-            elif choice in ["n", "no"]:
+            if choice in _NO:
                 return False
-            else:
-                warn("Please enter 'y' or 'n'.")
+            if not choice and default is not None:
+                return default
+            warn("Please enter 'y' or 'n'.")
 
     @classmethod
     def clear_console(cls) -> None:
@@ -432,19 +555,19 @@ class PromptAgent:
         if allow_back:
             console.print("[bold cyan]\\[b][/bold cyan] Back to previous menu")
 
-        # Generate valid letter choices
+        # Generate valid letter choices, and everything derived from them, once
         valid_choices = [chr(ord("a") + i) for i in range(num_options)]
         if allow_back:
             valid_choices.append("b")
+        valid_set = frozenset(valid_choices)
+        prompt_text = f"\n[bold cyan]→[/bold cyan] Choose ({'/'.join(valid_choices)}): "
+        retry_text = (
+            "  [cyan]Hmm, that's not one of the options. "
+            f"Try {', '.join(valid_choices)}[/cyan]"
+        )
 
         while True:
-            choice_letter = (
-                console.input(
-                    f"\n[bold cyan]→[/bold cyan] Choose ({'/'.join(valid_choices)}): "
-                )
-                .strip()
-                .lower()
-            )
+            choice_letter = console.input(prompt_text).strip().lower()
 
             if not choice_letter:
                 console.print("[cyan]Please choose one of the options above[/cyan]")
@@ -453,13 +576,11 @@ class PromptAgent:
             if choice_letter == "b" and allow_back:
                 return "__BACK__"
 
-            if choice_letter in valid_choices:
+            if choice_letter in valid_set:
                 selected_index = ord(choice_letter) - ord("a")
                 return options[selected_index]
             else:
-                console.print(
-                    f"  [cyan]Hmm, that's not one of the options. Try {', '.join(valid_choices)}[/cyan]"
-                )
+                console.print(retry_text)
 
     @classmethod
     def prompt_and_retry(
@@ -517,23 +638,10 @@ class PromptAgent:
         )
 
         console.print()
-        while True:
-            choice = (
-                console.input(
-                    "[bold cyan]→[/bold cyan] Can we contact you via email for support? (y/n) [y]: "
-                )
-                .strip()
-                .lower()
-                or "y"
-            )
-            if choice in ["y", "yes"]:
-                contact_via_email = True
-                break
-            elif choice in ["n", "no"]:
-                contact_via_email = False
-                break
-            else:
-                warn("Please enter 'y' or 'n'.")
+        contact_via_email = cls._yn(
+            "[bold cyan]→[/bold cyan] Can we contact you via email for support? (y/n) [y]: ",
+            default=True,
+        )
 
         return {
             "first_name": first_name,
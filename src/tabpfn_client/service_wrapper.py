@@ -3,8 +3,14 @@
 
 from __future__ import annotations
 
+import base64
+import json
 import logging
+import mmap
 import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 from uuid import UUID
@@ -28,6 +34,65 @@ from tabpfn_client.models import ApiMode
 logger = logging.getLogger(__name__)
 
 
+# Skip the round trip validating a cached token only while it stays valid for
+# at least this long, so it cannot expire between the check and its first use.
+_TOKEN_EXPIRY_MARGIN_SECS = 60.0
+# A token confirmed by the server is trusted without asking again for this
+# long at most, so a revoked token is noticed within minutes, not at its `exp`.
+_VALIDATED_TOKEN_TTL_SECS = 300.0
+# Upper bound on concurrent predictions in `InferenceClient.predict_batch`,
+# well below the connection pool size of the shared HTTP client.
+_PREDICT_BATCH_MAX_WORKERS = 4
+# Upper bound on concurrent DELETEs in `UserDataClient.delete_datasets`.
+_DELETE_DATASETS_MAX_WORKERS = 8
+
+
+def _jwt_exp(access_token: str) -> float | None:
+    """Read the `exp` claim of a JWT without verifying its signature.
+
+    Returns None if the token is not a JWT or has no numeric `exp` claim."""
+    parts = access_token.split(".")
+    if len(parts) != 3:
+        return None
+    payload = parts[1] + "=" * (-len(parts[1]) % 4)
+    try:
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+    except (ValueError, AttributeError):
+        return None
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    """Write `text` to `path` through a temporary file and `os.replace`, so a
+    crash mid-write or a concurrent reader never sees a partial file. Not
+    fsync'ed: the files written this way are caches that can be regenerated."""
+    # per-process name, two processes writing at once must not share it
+    tmp_file = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        try:
+            tmp_file.write_text(text)
+        except FileNotFoundError:
+            # only create the directory when it is actually missing (first run,
+            # or after `config.reset()` removed it), not on every write
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file.write_text(text)
+        os.replace(tmp_file, path)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+
+class _CacheFile:
+    """Class attribute holding the path of a file in the cache dir, resolved on
+    first access, so that importing this module does not resolve the cache dir."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, instance: object, owner: type | None = None) -> Path:
+        return constants.get_cache_dir() / self.name
+
+
 class ServiceClientWrapper:
     pass
 
@@ -42,7 +107,19 @@ class UserAuthenticationClient(ServiceClientWrapper, Singleton):
     This is implemented as a singleton class with classmethods.
     """
 
-    CACHED_TOKEN_FILE = constants.CACHE_DIR / "config"
+    CACHED_TOKEN_FILE = _CacheFile("config")
+    # token last confirmed by the server, with its expiry, see `_is_recently_validated`
+    VALIDATED_TOKEN_FILE = _CacheFile("token.json")
+    # greeting messages fetched alongside the token validation, see `start_session`
+    _prefetched_greeting_messages: list[str] | None = None
+    # (token, st_mtime_ns) of CACHED_TOKEN_FILE as last read or written, see `set_token`
+    _token_file_state: tuple[str, int] | None = None
+    # in-process copy of VALIDATED_TOKEN_FILE as (token, validated_at, exp)
+    _validated_token: tuple[str, float, float] | None = None
+    # a successful reachability probe is trusted for this long, so repeated
+    # auth attempts within one process don't probe the server again
+    _CONNECTION_OK_TTL_SECS = 30.0
+    _connection_ok_ts: float | None = None
 
     def __new__(cls):
         raise TypeError(
@@ -51,23 +128,47 @@ class UserAuthenticationClient(ServiceClientWrapper, Singleton):
 
     @classmethod
     def is_accessible_connection(cls) -> bool:
-        return ServiceClient.try_connection()
+        if (
+            cls._connection_ok_ts is not None
+            and (time.monotonic() - cls._connection_ok_ts) < cls._CONNECTION_OK_TTL_SECS
+        ):
+            return True
+        # only successes are cached, a failed probe is retried on the next call
+        is_accessible = ServiceClient.try_connection()
+        cls._connection_ok_ts = time.monotonic() if is_accessible else None
+        return is_accessible
 
     @classmethod
     def set_token(cls, access_token: str):
+        if (
+            cls._token_file_state is not None
+            and cls._token_file_state[0] == access_token
+            and ServiceClient.get_access_token() == access_token
+        ):
+            # already active, and the file is unchanged since we last saw it
+            # hold this token: one stat instead of re-reading it
+            try:
+                if cls.CACHED_TOKEN_FILE.stat().st_mtime_ns == cls._token_file_state[1]:
+                    return
+            except FileNotFoundError:
+                pass
+
         ServiceClient.authorize(access_token)
 
         # Mitigate parallel writes by checking if the token is already set to
         # the same value. We'll consider using fcntl if this problem persists.
         try:
-            if cls.CACHED_TOKEN_FILE.read_text() == access_token:
-                return
+            is_saved = cls.CACHED_TOKEN_FILE.read_text() == access_token
         except FileNotFoundError:
-            pass
-
-        # Write the new token
-        cls.CACHED_TOKEN_FILE.parent.mkdir(parents=True, exist_ok=True)
-        cls.CACHED_TOKEN_FILE.write_text(access_token)
+            is_saved = False
+
+        if not is_saved:
+            # Write the new token
+            _atomic_write_text(cls.CACHED_TOKEN_FILE, access_token)
+        cls._token_file_state = (
+            access_token,
+            cls.CACHED_TOKEN_FILE.stat().st_mtime_ns,
+        )
 
     @classmethod
     def validate_email(cls, email: str) -> tuple[bool, str]:
@@ -113,21 +214,92 @@ class UserAuthenticationClient(ServiceClientWrapper, Singleton):
                 access_token = cls.CACHED_TOKEN_FILE.read_text()
         else:
             access_token = ServiceClient.get_access_token()
+        if access_token is None:
+            return False, None
+
+        if cls._is_recently_validated(access_token):
+            cls.set_token(access_token)
+            return True, access_token
+
+        exp = _jwt_exp(access_token)
+        if exp is not None and exp <= time.time():
+            # expired for certain, the server would only reject it
+            logger.debug("Cached access token has expired")
+            cls._reset_token()  # it will also unset the TABPFN_TOKEN var
+            return False, None
 
-        is_valid = ServiceClient.is_auth_token_outdated(access_token)
+        is_valid, status_code, cls._prefetched_greeting_messages = (
+            ServiceClient.start_session(access_token)
+        )
         if is_valid is False:
             cls._reset_token()  # it will also unset the TABPFN_TOKEN var
+        if status_code in (401, 403):
+            # the server itself rejected the token, so the reachability probe
+            # that init() runs for rejected or unverified tokens can be
+            # skipped; any other error may come from a proxy in front of a
+            # server that is down
+            cls._connection_ok_ts = time.monotonic()
+        if is_valid is False:
             return False, None
         elif is_valid is None:
             return False, access_token
 
-        logger.debug(f"Reusing existing access token? {is_valid}")
-        if access_token is None:
-            return False, None
+        logger.debug("Reusing existing access token? %s", is_valid)
         cls.set_token(access_token)
+        cls._save_validated_token(access_token)
 
         return True, access_token
 
+    @classmethod
+    def _is_recently_validated(cls, access_token: str) -> bool:
+        """Whether `access_token` was confirmed by the server within the last
+        `_VALIDATED_TOKEN_TTL_SECS` and has not expired yet, so that a new
+        process can skip validating it again."""
+        if cls._validated_token is not None and cls._validated_token[0] == access_token:
+            _, validated_at, exp = cls._validated_token
+            return cls._is_fresh_validation(validated_at, exp)
+        try:
+            with (
+                open(cls.VALIDATED_TOKEN_FILE, "rb") as f,
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+            ):
+                cached = json.loads(bytes(mm))
+        except (OSError, ValueError):
+            # missing, empty or corrupt file
+            return False
+        if not isinstance(cached, dict) or cached.get("token") != access_token:
+            return False
+        exp = cached.get("exp")
+        validated_at = cached.get("validated_at")
+        if not isinstance(exp, (int, float)) or not isinstance(
+            validated_at, (int, float)
+        ):
+            return False
+        cls._validated_token = (access_token, validated_at, exp)
+        return cls._is_fresh_validation(validated_at, exp)
+
+    @staticmethod
+    def _is_fresh_validation(validated_at: float, exp: float) -> bool:
+        now = time.time()
+        # a validation time in the future means the clock was changed
+        if not 0 <= now - validated_at < _VALIDATED_TOKEN_TTL_SECS:
+            return False
+        return exp > now + _TOKEN_EXPIRY_MARGIN_SECS
+
+    @classmethod
+    def _save_validated_token(cls, access_token: str):
+        exp = _jwt_exp(access_token)
+        if exp is None:
+            # without a known expiry the token has to be validated every time
+            return
+        validated_at = time.time()
+        cls._validated_token = (access_token, validated_at, exp)
+        data = {"token": access_token, "validated_at": validated_at, "exp": exp}
+        try:
+            _atomic_write_text(cls.VALIDATED_TOKEN_FILE, json.dumps(data))
+        except OSError:
+            logger.debug("Failed to cache the validated token", exc_info=True)
+
     @classmethod
     def get_password_policy(cls):
         return ServiceClient.get_password_policy()
@@ -139,7 +311,12 @@ class UserAuthenticationClient(ServiceClientWrapper, Singleton):
     @classmethod
     def _reset_token(cls):
         ServiceClient.reset_authorization()
+        cls._prefetched_greeting_messages = None
+        cls._connection_ok_ts = None
+        cls._validated_token = None
+        cls._token_file_state = None
         cls.CACHED_TOKEN_FILE.unlink(missing_ok=True)
+        cls.VALIDATED_TOKEN_FILE.unlink(missing_ok=True)
         # The TABPFN_TOKEN var is always set externally in the environment, in
         # the client it can only be used or unset, never set.
         # Note: we should prefix with the module to make sure the variable is not
@@ -148,6 +325,10 @@ class UserAuthenticationClient(ServiceClientWrapper, Singleton):
 
     @classmethod
     def retrieve_greeting_messages(cls):
+        greeting_messages = cls._prefetched_greeting_messages
+        if greeting_messages is not None:
+            cls._prefetched_greeting_messages = None
+            return greeting_messages
         return ServiceClient.retrieve_greeting_messages()
 
     @classmethod
@@ -198,7 +379,7 @@ class UserDataClient(ServiceClientWrapper, Singleton):
         try:
             summary = ServiceClient.get_data_summary()
         except RuntimeError as e:
-            logging.error(f"Failed to get data summary: {e}")
+            logger.error("Failed to get data summary: %s", e)
             raise e
 
         return summary
@@ -208,13 +389,13 @@ class UserDataClient(ServiceClientWrapper, Singleton):
         try:
             saved_path = ServiceClient.download_all_data(save_dir)
         except RuntimeError as e:
-            logging.error(f"Failed to download data: {e}")
+            logger.error("Failed to download data: %s", e)
             raise e
 
         if saved_path is None:
             raise RuntimeError("Failed to download data.")
 
-        logging.info(f"Data saved to {saved_path}")
+        logger.info("Data saved to %s", saved_path)
         return saved_path
 
     @classmethod
@@ -222,10 +403,36 @@ class UserDataClient(ServiceClientWrapper, Singleton):
         try:
             deleted_datasets = ServiceClient.delete_dataset(dataset_uid)
         except RuntimeError as e:
-            logging.error(f"Failed to delete dataset: {e}")
+            logger.error("Failed to delete dataset: %s", e)
             raise e
 
-        logging.info(f"Deleted datasets: {deleted_datasets}")
+        logger.info("Deleted datasets: %s", deleted_datasets)
+
+        return deleted_datasets
+
+    @classmethod
+    def delete_datasets(cls, dataset_uids: list[str]) -> list[str]:
+        """
+        Delete several datasets. The server has no bulk delete for a selection
+        of datasets, so the deletions are sent concurrently over the shared
+        connection pool. Returns the deleted dataset UIDs, without duplicates
+        (deleting a train set also deletes its test sets).
+        """
+        if not dataset_uids:
+            return []
+        try:
+            with ThreadPoolExecutor(
+                max_workers=min(len(dataset_uids), _DELETE_DATASETS_MAX_WORKERS)
+            ) as executor:
+                results = list(executor.map(ServiceClient.delete_dataset, dataset_uids))
+        except RuntimeError as e:
+            logger.error("Failed to delete datasets: %s", e)
+            raise e
+
+        deleted_datasets = list(
+            dict.fromkeys(uid for deleted in results for uid in deleted)
+        )
+        logger.info("Deleted datasets: %s", deleted_datasets)
 
         return deleted_datasets
 
@@ -234,10 +441,10 @@ class UserDataClient(ServiceClientWrapper, Singleton):
         try:
             deleted_datasets = ServiceClient.delete_all_datasets()
         except RuntimeError as e:
-            logging.error(f"Failed to delete all datasets: {e}")
+            logger.error("Failed to delete all datasets: %s", e)
             raise e
 
-        logging.info(f"Deleted datasets: {deleted_datasets}")
+        logger.info("Deleted datasets: %s", deleted_datasets)
 
         return deleted_datasets
 
@@ -253,7 +460,7 @@ class UserDataClient(ServiceClientWrapper, Singleton):
         try:
             ServiceClient.delete_user_account()
         except RuntimeError as e:
-            logging.error(f"Failed to delete user account: {e}")
+            logger.error("Failed to delete user account: %s", e)
             raise e
 
         PromptAgent.prompt_account_deleted()
@@ -294,17 +501,100 @@ class InferenceClient(ServiceClientWrapper, Singleton):
             description=description,
         )
 
+    @classmethod
+    def fit_async(
+        cls,
+        X,
+        y,
+        task_config: FitTaskConfig,
+        tabpfn_systems: list[TabPFNSystem],
+        thinking_config: ThinkingConfig | None,
+        api_mode: ApiMode,
+        client_options: ClientOptions | None,
+        description: str | None,
+    ) -> Future[UUID]:
+        """
+        Like `fit`, but upload and fit the train set in the background, so the
+        caller can prepare its test data meanwhile. The returned future can be
+        passed to `predict` directly; errors are raised when it is resolved.
+
+        Runs on a daemon thread rather than an executor, whose workers are
+        joined at interpreter exit: a script that exits or is interrupted must
+        not wait for an upload it no longer needs.
+        """
+        future: Future[UUID] = Future()
+
+        def _fit():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(
+                    cls.fit(
+                        X,
+                        y,
+                        task_config=task_config,
+                        tabpfn_systems=tabpfn_systems,
+                        thinking_config=thinking_config,
+                        api_mode=api_mode,
+                        client_options=client_options,
+                        description=description,
+                    )
+                )
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=_fit, name="tabpfn-fit", daemon=True).start()
+        return future
+
     @classmethod
     def predict(
         cls,
         X,
-        fitted_train_set_id: UUID,
+        fitted_train_set_id: UUID | Future[UUID],
         task_config: ClassifierConfig | RegressorConfig,
         client_options: ClientOptions | None = None,
     ) -> PredictionResult:
+        if isinstance(fitted_train_set_id, Future):
+            # wait for a pending `fit_async`
+            fitted_train_set_id = fitted_train_set_id.result()
         return ServiceClient.predict(
             x_test=X,
             fitted_train_set_id=fitted_train_set_id,
             task_config=task_config,
             client_options=client_options,
         )
+
+    @classmethod
+    def predict_batch(
+        cls,
+        X_list: list,
+        fitted_train_set_id: UUID | Future[UUID],
+        task_config: ClassifierConfig | RegressorConfig,
+        client_options: ClientOptions | None = None,
+    ) -> list[PredictionResult]:
+        """
+        Predict several test sets against the same fitted train set. Results are
+        returned in the order of `X_list`.
+
+        The server has no batch prediction endpoint, so the test sets are sent as
+        separate predict calls, but concurrently over the shared connection pool,
+        so the round trips overlap instead of adding up.
+        """
+        if isinstance(fitted_train_set_id, Future):
+            fitted_train_set_id = fitted_train_set_id.result()
+        if len(X_list) <= 1:
+            return [
+                cls.predict(X, fitted_train_set_id, task_config, client_options)
+                for X in X_list
+            ]
+        with ThreadPoolExecutor(
+            max_workers=min(len(X_list), _PREDICT_BATCH_MAX_WORKERS)
+        ) as executor:
+            return list(
+                executor.map(
+                    lambda X: cls.predict(
+                        X, fitted_train_set_id, task_config, client_options
+                    ),
+                    X_list,
+                )
+            )
@@ -7,17 +7,14 @@ import os
 import sys
 from collections.abc import Generator
 from contextlib import contextmanager
+from typing import TYPE_CHECKING
 
 from rich.console import Console
-from rich.logging import RichHandler
-from rich.panel import Panel
-from rich.progress import (
-    BarColumn,
-    Progress,
-    SpinnerColumn,
-    TextColumn,
-    TimeElapsedColumn,
-)
+
+if TYPE_CHECKING:
+    # rich.logging, rich.panel and rich.progress are imported by the helpers
+    # that use them, the login/registration flow only needs the console.
+    from rich.progress import Progress
 
 
 def _should_use_color() -> bool:
@@ -36,6 +33,8 @@ console = Console(soft_wrap=False, highlight=True, force_terminal=_should_use_co
 def setup_logging(verbosity: int = 0) -> None:
     """Configure logging to emit through Rich with a consistent style."""
 
+    from rich.logging import RichHandler
+
     level = logging.WARNING - min(verbosity, 2) * 10
     logging.basicConfig(
         level=level,
@@ -54,6 +53,8 @@ def setup_logging(verbosity: int = 0) -> None:
 def header(title: str, subtitle: str | None = None) -> None:
     """Render a section header."""
 
+    from rich.panel import Panel
+
     console.print(
         Panel.fit(
             title if not subtitle else f"[bold]{title}[/bold]\n[dim]{subtitle}[/dim]"
@@ -84,6 +85,14 @@ def status(message: str) -> Generator[None]:
 
 
 def progress_bar(description: str = "Working...") -> Progress:
+    from rich.progress import (
+        BarColumn,
+        Progress,
+        SpinnerColumn,
+        TextColumn,
+        TimeElapsedColumn,
+    )
+
     return Progress(
         SpinnerColumn(),
         TextColumn("[bold]{task.description}"),
@@ -20,8 +20,15 @@ def model_limit_from_version(
     raise ValueError(f"No model limits registered at or below {model_version}")
 
 
+# Path markers are built once: iterating the enum and reading `.value` goes
+# through the Enum metaclass and member descriptors on every call.
+_MODEL_VERSION_PATH_MARKERS = tuple(
+    (f"-{version.value}-", version) for version in ModelVersion
+)
+
+
 def model_version_from_path(model_path: str) -> ModelVersion:
-    for version in ModelVersion:
-        if f"-{version.value}-" in model_path:
+    for marker, version in _MODEL_VERSION_PATH_MARKERS:
+        if marker in model_path:
             return version
     raise ValueError(f"Invalid model path: {model_path}")
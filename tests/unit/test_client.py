@@ -688,6 +688,61 @@ class TestServiceClient(unittest.TestCase):
 
         self.assertIs(result, stale)
 
+    def test_is_auth_token_outdated_retries_transport_errors(self):
+        response = Mock(status_code=200, headers={})
+        with (
+            patch("backoff._sync.time.sleep"),
+            patch.object(
+                ServiceClient.httpx_client,
+                "get",
+                side_effect=[httpx.PoolTimeout("pool exhausted"), response],
+            ) as mock_get,
+        ):
+            self.assertTrue(ServiceClient.is_auth_token_outdated("dummy_token"))
+
+        self.assertEqual(mock_get.call_count, 2)
+
+    def test_is_auth_token_outdated_does_not_retry_read_timeouts(self):
+        with (
+            patch("backoff._sync.time.sleep"),
+            patch.object(
+                ServiceClient.httpx_client,
+                "get",
+                side_effect=httpx.ReadTimeout("server hangs"),
+            ) as mock_get,
+            self.assertRaises(httpx.ReadTimeout),
+        ):
+            ServiceClient.is_auth_token_outdated("dummy_token")
+
+        self.assertEqual(mock_get.call_count, 1)
+
+    @with_mock_server()
+    def test_get_data_summary_revalidates_with_etag(self, mock_server):
+        summary = {"user": {"uid": "dummy"}}
+        route = mock_server.router.get(mock_server.endpoints.get_data_summary.path)
+        route.side_effect = [
+            httpx.Response(200, json=summary, headers={"ETag": '"v1"'}),
+            httpx.Response(304),
+        ]
+
+        self.assertEqual(summary, ServiceClient.get_data_summary())
+        self.assertEqual(summary, ServiceClient.get_data_summary())
+
+        self.assertNotIn("If-None-Match", route.calls[0].request.headers)
+        self.assertEqual('"v1"', route.calls[1].request.headers["If-None-Match"])
+
+    def test_close_client_keeps_authorization(self):
+        ServiceClient.authorize("dummy_token")
+        old_client = ServiceClient.httpx_client
+
+        ServiceClient._close_client()
+
+        self.assertTrue(old_client.is_closed)
+        self.assertIsNot(ServiceClient.httpx_client, old_client)
+        self.assertEqual(
+            ServiceClient.httpx_client.headers["Authorization"], "Bearer dummy_token"
+        )
+
 
 class TestServiceClientPredictionNormalization(unittest.TestCase):
     def tearDown(self):
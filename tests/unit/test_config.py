@@ -0,0 +1,186 @@
+import base64
+import json
+import threading
+import time
+import unittest
+import uuid
+from unittest.mock import patch
+
+import httpx
+import numpy as np
+import respx
+
+from tabpfn_client import TabPFNClassifier, config
+from tabpfn_client.client import ServiceClient
+from tabpfn_client.config import Config, get_access_token, set_access_token
+from tabpfn_client.service_wrapper import UserAuthenticationClient
+from tests.mock_tabpfn_server import with_mock_server
+
+
+class TestGetAccessToken(unittest.TestCase):
+    def setUp(self):
+        config.reset()
+        ServiceClient.reset_authorization()
+
+    def tearDown(self):
+        config.reset()
+        ServiceClient.reset_authorization()
+
+    def test_set_access_token_is_returned_without_init(self):
+        set_access_token("dummy_token")
+
+        with patch("tabpfn_client.config.init") as mock_init:
+            self.assertEqual("dummy_token", get_access_token())
+            mock_init.assert_not_called()
+
+    def test_set_access_token_enables_server_mode(self):
+        Config.use_server = False
+        set_access_token("dummy_token")
+
+        with (
+            patch("tabpfn_client.config._init") as mock_init,
+            patch.object(ServiceClient, "fit", return_value=uuid.uuid4()) as mock_fit,
+        ):
+            TabPFNClassifier().fit(np.random.rand(10, 3), np.array([0, 1] * 5))
+            mock_init.assert_not_called()
+        mock_fit.assert_called_once()
+
+        config.reset()
+        self.assertFalse(UserAuthenticationClient.CACHED_TOKEN_FILE.exists())
+
+    def test_token_is_cached_after_first_call(self):
+        ServiceClient.authorize("dummy_token")
+        Config.is_initialized = True
+
+        with patch.object(
+            ServiceClient, "get_access_token", wraps=ServiceClient.get_access_token
+        ) as mock_get:
+            self.assertEqual("dummy_token", get_access_token())
+            self.assertEqual("dummy_token", get_access_token())
+            self.assertEqual(1, mock_get.call_count)
+
+    def test_reset_clears_cached_token(self):
+        set_access_token("dummy_token")
+
+        config.reset()
+
+        self.assertIsNone(Config.token)
+        self.assertFalse(Config.is_initialized)
+
+
+class TestRejectedToken(unittest.TestCase):
+    def tearDown(self):
+        config.reset()
+        ServiceClient.reset_authorization()
+
+    @with_mock_server()
+    def test_unauthorized_call_forgets_token(self, mock_server):
+        set_access_token("dummy_token")
+        UserAuthenticationClient.VALIDATED_TOKEN_FILE.write_text(
+            json.dumps({"token": "dummy_token", "validated_at": 0, "exp": 0})
+        )
+        mock_server.router.get(mock_server.endpoints.get_data_summary.path).respond(
+            401, json={"detail": "Invalid token"}
+        )
+
+        with self.assertRaisesRegex(RuntimeError, "HTTP 401"):
+            ServiceClient.get_data_summary()
+
+        self.assertIsNone(ServiceClient.get_access_token())
+        self.assertIsNone(Config.token)
+        self.assertFalse(Config.is_initialized)
+        self.assertFalse(UserAuthenticationClient.CACHED_TOKEN_FILE.exists())
+        self.assertFalse(UserAuthenticationClient.VALIDATED_TOKEN_FILE.exists())
+
+
+class TestGetApiUsage(unittest.TestCase):
+    usage = {"current_usage": 5, "usage_limit": 100, "reset_time": "tomorrow"}
+
+    def setUp(self):
+        config.reset()
+        set_access_token("dummy_token")
+
+    def tearDown(self):
+        config.reset()
+        ServiceClient.reset_authorization()
+
+    def test_usage_is_cached_within_ttl(self):
+        with patch.object(
+            ServiceClient, "get_api_usage", return_value=self.usage
+        ) as mock_usage:
+            first = config.get_api_usage()
+            second = config.get_api_usage()
+
+        self.assertEqual(first, second)
+        self.assertEqual(1, mock_usage.call_count)
+
+    def test_usage_is_refetched_after_ttl(self):
+        with patch.object(
+            ServiceClient, "get_api_usage", return_value=self.usage
+        ) as mock_usage:
+            config.get_api_usage()
+            with patch(
+                "tabpfn_client.config.time.monotonic",
+                return_value=10**9,
+            ):
+                config.get_api_usage()
+
+        self.assertEqual(2, mock_usage.call_count)
+
+    def test_unlimited_usage_limit(self):
+        for raw_limit in (-1, "-1"):
+            config._api_usage_cache.clear()
+            usage = {**self.usage, "usage_limit": raw_limit}
+            with patch.object(ServiceClient, "get_api_usage", return_value=usage):
+                self.assertEqual(
+                    "Currently, you have used 5 of the allowed limit of Unlimited "
+                    "credits. The limit will reset at tomorrow.",
+                    config.get_api_usage(),
+                )
+
+
+class TestInit(unittest.TestCase):
+    def setUp(self):
+        config.reset()
+
+    def tearDown(self):
+        config.reset()
+        ServiceClient.reset_authorization()
+
+    def test_unreachable_server_after_reusing_validated_token(self):
+        payload = base64.urlsafe_b64encode(
+            json.dumps({"exp": time.time() + 3600}).encode()
+        )
+        jwt_token = f"header.{payload.decode().rstrip('=')}.signature"
+        token_file = UserAuthenticationClient.CACHED_TOKEN_FILE
+        token_file.parent.mkdir(parents=True, exist_ok=True)
+        token_file.write_text(jwt_token)
+        UserAuthenticationClient._save_validated_token(jwt_token)
+        UserAuthenticationClient._validated_token = None
+
+        with respx.mock(base_url=str(ServiceClient.httpx_client.base_url)) as router:
+            router.route().mock(side_effect=httpx.ConnectError("down"))
+            with self.assertRaisesRegex(RuntimeError, "inaccessible"):
+                config.init()
+
+        self.assertFalse(Config.is_initialized)
+
+    def test_concurrent_init_runs_once(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def _slow_init():
+            started.set()
+            release.wait(timeout=5)
+            Config.is_initialized = True
+
+        with patch("tabpfn_client.config._init", side_effect=_slow_init) as mock_init:
+            threads = [threading.Thread(target=config.init) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            started.wait(timeout=5)
+            release.set()
+            for thread in threads:
+                thread.join(timeout=5)
+
+        self.assertEqual(1, mock_init.call_count)
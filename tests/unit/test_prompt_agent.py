@@ -1,9 +1,98 @@
+import threading
 import unittest
 from unittest.mock import patch
 from tabpfn_client.prompt_agent import PromptAgent
 
 
 class TestPromptAgent(unittest.TestCase):
+    def setUp(self):
+        PromptAgent._password_policy = None
+        PromptAgent._email_validation_cache.clear()
+
+    def tearDown(self):
+        PromptAgent._password_policy = None
+        PromptAgent._email_validation_cache.clear()
+
+    def test_validate_email_is_cached_per_normalized_email(self):
+        with patch(
+            "tabpfn_client.prompt_agent.UserAuthenticationClient"
+        ) as mock_auth_client:
+            mock_auth_client.validate_email.return_value = (True, "")
+
+            first = PromptAgent._validate_email("User@Example.com")
+            second = PromptAgent._validate_email("user@example.com")
+
+        self.assertEqual((True, ""), first)
+        self.assertEqual(first, second)
+        mock_auth_client.validate_email.assert_called_once_with("User@Example.com")
+
+    def test_validate_email_does_not_cache_rejections(self):
+        with patch(
+            "tabpfn_client.prompt_agent.UserAuthenticationClient"
+        ) as mock_auth_client:
+            mock_auth_client.validate_email.side_effect = [
+                (False, "Service unavailable"),
+                (True, ""),
+            ]
+
+            self.assertFalse(PromptAgent._validate_email("user@example.com")[0])
+            self.assertTrue(PromptAgent._validate_email("user@example.com")[0])
+
+        self.assertEqual(2, mock_auth_client.validate_email.call_count)
+
+    def test_validate_email_rejects_malformed_email_locally(self):
+        with patch(
+            "tabpfn_client.prompt_agent.UserAuthenticationClient"
+        ) as mock_auth_client:
+            for email in ("no-at-sign", "@example.com", "user@localhost"):
+                is_valid, _ = PromptAgent._validate_email(email)
+                self.assertFalse(is_valid)
+
+        mock_auth_client.validate_email.assert_not_called()
+
+    def test_password_policy_is_cached(self):
+        with patch(
+            "tabpfn_client.prompt_agent.UserAuthenticationClient"
+        ) as mock_auth_client:
+            mock_auth_client.get_password_policy.return_value = ["Length(8)"]
+
+            first = PromptAgent._get_password_policy()
+            second = PromptAgent._get_password_policy()
+
+        self.assertIs(first, second)
+        self.assertEqual([("length", "Length(8)")], first[0])
+        mock_auth_client.get_password_policy.assert_called_once()
+
+    def test_prefetched_password_policy_is_reused(self):
+        with patch(
+            "tabpfn_client.prompt_agent.UserAuthenticationClient"
+        ) as mock_auth_client:
+            mock_auth_client.get_password_policy.return_value = ["Length(8)"]
+
+            future = PromptAgent._prefetch_password_policy()
+            password_reqs, _ = PromptAgent._get_password_policy(future)
+            # a fresh cached policy needs no further prefetch
+            self.assertIsNone(PromptAgent._prefetch_password_policy())
+
+        self.assertEqual([("length", "Length(8)")], password_reqs)
+        mock_auth_client.get_password_policy.assert_called_once()
+
+    def test_password_policy_prefetch_does_not_block_exit(self):
+        fetched_on = []
+
+        def _get_password_policy():
+            fetched_on.append(threading.current_thread())
+            return ["Length(8)"]
+
+        with patch(
+            "tabpfn_client.prompt_agent.UserAuthenticationClient"
+        ) as mock_auth_client:
+            mock_auth_client.get_password_policy.side_effect = _get_password_policy
+            PromptAgent._prefetch_password_policy().result(timeout=5)
+
+        # the interpreter does not wait for daemon threads on exit
+        self.assertTrue(fetched_on[0].daemon)
+
     def test_password_req_to_policy(self):
         password_req = ["Length(8)", "Uppercase(1)", "Numbers(1)", "Special(1)"]
         password_policy = PromptAgent.password_req_to_policy(password_req)
@@ -101,6 +190,16 @@ class TestPromptAgent(unittest.TestCase):
         result = PromptAgent.prompt_terms_and_cond()
         self.assertFalse(result)
 
+    @patch("rich.console.Console.input", side_effect=["maybe", "", " YES "])
+    def test_yn_retries_until_answered(self, mock_input):
+        self.assertTrue(PromptAgent._yn("? "))
+        self.assertEqual(3, mock_input.call_count)
+
+    @patch("rich.console.Console.input", return_value="")
+    def test_yn_empty_answer_returns_default(self, mock_input):
+        self.assertTrue(PromptAgent._yn("? ", default=True))
+        self.assertFalse(PromptAgent._yn("? ", default=False))
+
     @patch("rich.console.Console.input", return_value="1")
     def test_choice_with_retries_valid_first_try(self, mock_console_input):
         result = PromptAgent._choice_with_retries(
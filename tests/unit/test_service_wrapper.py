@@ -1,15 +1,42 @@
+import base64
+import json
+import tempfile
+import threading
+import time
 import unittest
 import zipfile
 from unittest.mock import patch
 from io import BytesIO
 from pathlib import Path
 
+import httpx
 from tests.mock_tabpfn_server import with_mock_server
-from tabpfn_client.service_wrapper import UserAuthenticationClient, UserDataClient
-from tabpfn_client.client import ServiceClient
+from tabpfn_client.service_wrapper import (
+    _atomic_write_text,
+    InferenceClient,
+    UserAuthenticationClient,
+    UserDataClient,
+)
+from tabpfn_client.client import PredictionResult, ServiceClient
 from tabpfn_client.options import get_opts
 
 
+class TestAtomicWriteText(unittest.TestCase):
+    def test_failed_write_keeps_previous_content(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "nested" / "config"
+            _atomic_write_text(path, "old_token")
+
+            with (
+                patch("tabpfn_client.service_wrapper.os.replace", side_effect=OSError),
+                self.assertRaises(OSError),
+            ):
+                _atomic_write_text(path, "new_token")
+
+            self.assertEqual("old_token", path.read_text())
+            self.assertEqual(["config"], [p.name for p in path.parent.iterdir()])
+
+
 class TestUserAuthClient(unittest.TestCase):
     """
     These test cases are meant to validate the interface between the client and the server.
@@ -21,6 +48,15 @@ class TestUserAuthClient(unittest.TestCase):
 
     def tearDown(self):
         UserAuthenticationClient.CACHED_TOKEN_FILE.unlink(missing_ok=True)
+        UserAuthenticationClient.VALIDATED_TOKEN_FILE.unlink(missing_ok=True)
+        UserAuthenticationClient._connection_ok_ts = None
+        UserAuthenticationClient._validated_token = None
+        UserAuthenticationClient._token_file_state = None
+
+    @staticmethod
+    def _jwt(exp: float) -> str:
+        payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode())
+        return f"header.{payload.decode().rstrip('=')}.signature"
 
     @with_mock_server()
     def test_set_token_by_valid_login(self, mock_server):
@@ -42,6 +78,22 @@ class TestUserAuthClient(unittest.TestCase):
         # assert token is set
         self.assertEqual(dummy_token, ServiceClient.get_access_token())
 
+    def test_set_token_skips_unchanged_token(self):
+        UserAuthenticationClient.set_token("dummy_token")
+
+        with patch.object(ServiceClient, "authorize") as mock_authorize:
+            UserAuthenticationClient.set_token("dummy_token")
+            mock_authorize.assert_not_called()
+
+            # the file was removed behind our back, so it has to be rewritten
+            UserAuthenticationClient.CACHED_TOKEN_FILE.unlink()
+            UserAuthenticationClient.set_token("dummy_token")
+            mock_authorize.assert_called_once_with("dummy_token")
+
+        self.assertEqual(
+            "dummy_token", UserAuthenticationClient.CACHED_TOKEN_FILE.read_text()
+        )
+
     @with_mock_server()
     def test_set_token_by_invalid_login(self, mock_server):
         # mock invalid login response
@@ -75,6 +127,177 @@ class TestUserAuthClient(unittest.TestCase):
         # assert token is set
         self.assertEqual(dummy_token, ServiceClient.get_access_token())
 
+    @with_mock_server()
+    def test_try_reusing_validated_token_skips_server(self, mock_server):
+        jwt_token = self._jwt(time.time() + 3600)
+        token_file = UserAuthenticationClient.CACHED_TOKEN_FILE
+        token_file.parent.mkdir(parents=True, exist_ok=True)
+        token_file.write_text(jwt_token)
+
+        auth_route = mock_server.router.get(
+            mock_server.endpoints.protected_root.path
+        ).respond(200)
+        self.assertEqual(
+            (True, jwt_token), UserAuthenticationClient.try_reuse_existing_token()
+        )
+        self.assertTrue(UserAuthenticationClient.VALIDATED_TOKEN_FILE.exists())
+
+        # a new process only knows the token file on disk
+        ServiceClient.reset_authorization()
+        UserAuthenticationClient._validated_token = None
+        self.assertEqual(
+            (True, jwt_token), UserAuthenticationClient.try_reuse_existing_token()
+        )
+        self.assertEqual(1, auth_route.call_count)
+
+    @with_mock_server()
+    def test_try_reusing_stale_validated_token_is_validated(self, mock_server):
+        jwt_token = self._jwt(time.time() + 3600)
+        token_file = UserAuthenticationClient.CACHED_TOKEN_FILE
+        token_file.parent.mkdir(parents=True, exist_ok=True)
+        token_file.write_text(jwt_token)
+
+        auth_route = mock_server.router.get(
+            mock_server.endpoints.protected_root.path
+        ).respond(200)
+        UserAuthenticationClient.try_reuse_existing_token()
+
+        # a new process, long after the validation, e.g. the token was revoked
+        ServiceClient.reset_authorization()
+        UserAuthenticationClient._validated_token = None
+        auth_route.respond(401)
+        with patch(
+            "tabpfn_client.service_wrapper.time.time",
+            return_value=time.time() + 600,
+        ):
+            self.assertEqual(
+                (False, None), UserAuthenticationClient.try_reuse_existing_token()
+            )
+
+        self.assertEqual(2, auth_route.call_count)
+        self.assertFalse(UserAuthenticationClient.VALIDATED_TOKEN_FILE.exists())
+
+    @with_mock_server()
+    def test_in_memory_validated_token_expires(self, mock_server):
+        jwt_token = self._jwt(time.time() + 3600)
+        token_file = UserAuthenticationClient.CACHED_TOKEN_FILE
+        token_file.parent.mkdir(parents=True, exist_ok=True)
+        token_file.write_text(jwt_token)
+
+        auth_route = mock_server.router.get(
+            mock_server.endpoints.protected_root.path
+        ).respond(200)
+        UserAuthenticationClient.try_reuse_existing_token()
+        UserAuthenticationClient.try_reuse_existing_token()
+        self.assertEqual(1, auth_route.call_count)
+
+        # same process, past the TTL
+        with patch(
+            "tabpfn_client.service_wrapper.time.time",
+            return_value=time.time() + 600,
+        ):
+            UserAuthenticationClient.try_reuse_existing_token()
+        self.assertEqual(2, auth_route.call_count)
+
+    @with_mock_server()
+    def test_try_reusing_expiring_token_is_validated(self, mock_server):
+        jwt_token = self._jwt(time.time() + 10)
+        token_file = UserAuthenticationClient.CACHED_TOKEN_FILE
+        token_file.parent.mkdir(parents=True, exist_ok=True)
+        token_file.write_text(jwt_token)
+
+        auth_route = mock_server.router.get(
+            mock_server.endpoints.protected_root.path
+        ).respond(200)
+        UserAuthenticationClient.try_reuse_existing_token()
+        ServiceClient.reset_authorization()
+        UserAuthenticationClient.try_reuse_existing_token()
+
+        self.assertEqual(2, auth_route.call_count)
+
+    def test_try_reusing_expired_token_skips_server(self):
+        token_file = UserAuthenticationClient.CACHED_TOKEN_FILE
+        token_file.parent.mkdir(parents=True, exist_ok=True)
+        token_file.write_text(self._jwt(time.time() - 10))
+
+        with patch.object(ServiceClient, "start_session") as mock_start_session:
+            self.assertEqual(
+                (False, None), UserAuthenticationClient.try_reuse_existing_token()
+            )
+
+        mock_start_session.assert_not_called()
+        self.assertFalse(token_file.exists())
+
+    @with_mock_server()
+    def test_try_reusing_token_prefetches_greeting_messages(self, mock_server):
+        token_file = UserAuthenticationClient.CACHED_TOKEN_FILE
+        token_file.parent.mkdir(parents=True, exist_ok=True)
+        token_file.write_text("dummy_token")
+
+        mock_server.router.get(mock_server.endpoints.protected_root.path).respond(200)
+        greeting_route = mock_server.router.get(
+            mock_server.endpoints.retrieve_greeting_messages.path
+        ).respond(200, json={"messages": ["hello"]})
+
+        self.assertTrue(UserAuthenticationClient.try_reuse_existing_token()[0])
+        self.assertEqual(
+            ["hello"], UserAuthenticationClient.retrieve_greeting_messages()
+        )
+        self.assertEqual(1, greeting_route.call_count)
+
+        # the prefetched messages are only handed out once
+        greeting_route.respond(200, json={"messages": []})
+        self.assertEqual([], UserAuthenticationClient.retrieve_greeting_messages())
+        self.assertEqual(2, greeting_route.call_count)
+
+    def test_accessible_connection_is_cached_only_on_success(self):
+        with patch.object(
+            ServiceClient, "try_connection", side_effect=[False, True]
+        ) as mock_try:
+            self.assertFalse(UserAuthenticationClient.is_accessible_connection())
+            self.assertTrue(UserAuthenticationClient.is_accessible_connection())
+            self.assertTrue(UserAuthenticationClient.is_accessible_connection())
+
+        self.assertEqual(2, mock_try.call_count)
+
+    @with_mock_server()
+    def test_rejected_token_counts_as_accessible_connection(self, mock_server):
+        token_file = UserAuthenticationClient.CACHED_TOKEN_FILE
+        token_file.parent.mkdir(parents=True, exist_ok=True)
+        auth_route = mock_server.router.get(mock_server.endpoints.protected_root.path)
+        mock_server.router.get(
+            mock_server.endpoints.retrieve_greeting_messages.path
+        ).respond(403)
+
+        # unverified (403) and invalid (401) tokens both reached the server
+        for status_code, expected in ((403, "dummy_token"), (401, None)):
+            token_file.write_text("dummy_token")
+            auth_route.respond(status_code)
+            self.assertEqual(
+                (False, expected), UserAuthenticationClient.try_reuse_existing_token()
+            )
+            with patch.object(ServiceClient, "try_connection") as mock_try:
+                self.assertTrue(UserAuthenticationClient.is_accessible_connection())
+            mock_try.assert_not_called()
+
+    @with_mock_server()
+    def test_server_error_on_token_validation_is_not_accessible(self, mock_server):
+        token_file = UserAuthenticationClient.CACHED_TOKEN_FILE
+        token_file.parent.mkdir(parents=True, exist_ok=True)
+        token_file.write_text("dummy_token")
+        # e.g. a load balancer in front of a server that is down
+        mock_server.router.get(mock_server.endpoints.protected_root.path).respond(503)
+        mock_server.router.get(
+            mock_server.endpoints.retrieve_greeting_messages.path
+        ).respond(503)
+
+        UserAuthenticationClient.try_reuse_existing_token()
+        with patch.object(
+            ServiceClient, "try_connection", return_value=False
+        ) as mock_try:
+            self.assertFalse(UserAuthenticationClient.is_accessible_connection())
+        mock_try.assert_called_once()
+
     def test_try_reusing_non_existing_token(self):
         # assert no exception is raised
         UserAuthenticationClient.try_reuse_existing_token()
@@ -217,6 +440,23 @@ class TestUserDataClient(unittest.TestCase):
         # delete the zip file
         zip_file_path.unlink()
 
+    @with_mock_server()
+    def test_interrupted_download_leaves_no_file(self, mock_server):
+        def _broken_stream():
+            yield b"partial content"
+            raise httpx.ReadError("connection dropped")
+
+        mock_server.router.get(mock_server.endpoints.download_all_data.path).respond(
+            200,
+            stream=_broken_stream(),
+            headers={"Content-Disposition": "attachment; filename=all_data.zip"},
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(httpx.ReadError):
+                UserDataClient.download_all_data(Path(tmp))
+            self.assertEqual([], list(Path(tmp).iterdir()))
+
     @with_mock_server()
     def test_delete_datasets_accepts_empty_uid_list(self, mock_server):
         # mock delete_dataset response (with empty list)
@@ -237,6 +477,23 @@ class TestUserDataClient(unittest.TestCase):
         # assert no exception is raised
         self.assertEqual(["dummy_uid"], UserDataClient.delete_dataset("dummy_uid"))
 
+    @with_mock_server()
+    def test_delete_several_datasets(self, mock_server):
+        def _delete(request):
+            uid = request.url.params["dataset_uid"]
+            # deleting a train set also deletes its test set
+            deleted = [uid, "test_uid"] if uid == "train_uid" else [uid]
+            return httpx.Response(200, json={"deleted_dataset_uids": deleted})
+
+        route = mock_server.router.delete(mock_server.endpoints.delete_dataset.path)
+        route.side_effect = _delete
+
+        self.assertEqual(
+            ["train_uid", "test_uid", "other_uid"],
+            UserDataClient.delete_datasets(["train_uid", "test_uid", "other_uid"]),
+        )
+        self.assertEqual(3, route.call_count)
+
     @with_mock_server()
     def test_delete_all_datasets_accepts_empty_uid_list(self, mock_server):
         # mock delete_all_datasets response (with empty list)
@@ -299,3 +556,71 @@ class TestUserDataClient(unittest.TestCase):
         mock_confirm_deletion.return_value = True
 
         self.assertRaises(RuntimeError, UserDataClient.delete_user_account)
+
+
+class TestInferenceClient(unittest.TestCase):
+    def test_predict_batch_keeps_input_order(self):
+        def _predict(x_test, fitted_train_set_id, task_config, client_options):
+            # finish the first test set last to check results are not reordered
+            if x_test == 0:
+                time.sleep(0.05)
+            return PredictionResult(y_pred=x_test, metadata={})
+
+        with patch.object(
+            ServiceClient, "predict", side_effect=_predict
+        ) as mock_predict:
+            results = InferenceClient.predict_batch(
+                [0, 1, 2], fitted_train_set_id="dummy_uid", task_config=None
+            )
+
+        self.assertEqual([0, 1, 2], [result.y_pred for result in results])
+        self.assertEqual(3, mock_predict.call_count)
+
+    def test_predict_waits_for_fit_async(self):
+        with (
+            patch.object(ServiceClient, "fit", return_value="dummy_uid") as mock_fit,
+            patch.object(
+                ServiceClient,
+                "predict",
+                return_value=PredictionResult(y_pred=[0], metadata={}),
+            ) as mock_predict,
+        ):
+            future = InferenceClient.fit_async(
+                [[0]],
+                [0],
+                task_config=None,
+                tabpfn_systems=[],
+                thinking_config=None,
+                api_mode=None,
+                client_options=None,
+                description=None,
+            )
+            InferenceClient.predict([[0]], future, task_config=None)
+
+        mock_fit.assert_called_once()
+        self.assertEqual(
+            "dummy_uid", mock_predict.call_args.kwargs["fitted_train_set_id"]
+        )
+
+    def test_fit_async_does_not_block_exit(self):
+        fitted_on = []
+
+        def _fit(*args, **kwargs):
+            fitted_on.append(threading.current_thread())
+            return "dummy_uid"
+
+        with patch.object(ServiceClient, "fit", side_effect=_fit):
+            future = InferenceClient.fit_async(
+                [[0]],
+                [0],
+                task_config=None,
+                tabpfn_systems=[],
+                thinking_config=None,
+                api_mode=None,
+                client_options=None,
+                description=None,
+            )
+            self.assertEqual("dummy_uid", future.result(timeout=5))
+
+        # the interpreter does not wait for daemon threads on exit
+        self.assertTrue(fitted_on[0].daemon)
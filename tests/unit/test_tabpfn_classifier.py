@@ -188,8 +188,8 @@ class TestTabPFNClassifierInit(unittest.TestCase):
     def test_invalid_saved_access_token(self, mock_server, mock_prompt_and_set_token):
         mock_prompt_and_set_token.side_effect = [RuntimeError]
 
-        # mock connection and invalid authentication
-        mock_server.router.get(mock_server.endpoints.root.path).respond(200)
+        # mock invalid authentication; the rejection already shows the server
+        # is reachable, so no separate connection probe is made
         mock_server.router.get(mock_server.endpoints.protected_root.path).respond(401)
 
         # create dummy token file